@@ -9,8 +9,11 @@ import plotly.graph_objects as go
 from datetime import datetime
 import time
 import os
+import io
+from collections import Counter
+from sqlalchemy import select, func
 
-from database import init_db, get_db, SecurityEvent, QuantumMeasurement, SystemState, get_or_create_system_state, ProcessEvent, AutomatedResponse
+from database import init_db, get_db, SecurityEvent, QuantumMeasurement, SystemState, get_system_state_snapshot, set_system_state, ProcessEvent, AutomatedResponse
 from file_monitor import add_monitored_file, scan_all_monitored_files, get_all_monitored_files, remove_monitored_file
 from malware_detector import scan_running_processes, terminate_suspicious_process, get_suspicious_processes_history, get_recent_automated_responses
 from ransomware_detector import ransomware_detector
@@ -18,6 +21,9 @@ from trusted_sources import trusted_sources_manager
 
 init_db()
 
+# Simulator instance is looked up once and reused on every rerun
+QASM_BACKEND = Aer.get_backend('qasm_simulator')
+
 st.set_page_config(page_title="Quantum Security System", layout="wide")
 
 st.title("🔐 Quantum Entanglement Self-Healing Security System")
@@ -53,12 +59,14 @@ with st.expander("🏰 About This System: Defense-in-Depth Protection"):
 if 'db_initialized' not in st.session_state:
     db = get_db()
     try:
-        sys_state = get_or_create_system_state(db)
-        st.session_state.system_version = sys_state.system_version
-        st.session_state.system_resets = sys_state.total_resets
-        st.session_state.quantum_intact = sys_state.quantum_intact
+        sys_state = get_system_state_snapshot(db)
+        st.session_state.system_version = sys_state['system_version']
+        st.session_state.system_resets = sys_state['total_resets']
+        st.session_state.quantum_intact = sys_state['quantum_intact']
         
-        security_events = db.query(SecurityEvent).order_by(SecurityEvent.timestamp.desc()).limit(50).all()
+        security_events = db.query(
+            SecurityEvent.timestamp, SecurityEvent.event_type, SecurityEvent.reason
+        ).order_by(SecurityEvent.timestamp.desc()).limit(50).all()
         st.session_state.attack_log = [
             {
                 'timestamp': event.timestamp.strftime("%H:%M:%S"),
@@ -68,11 +76,14 @@ if 'db_initialized' not in st.session_state:
             for event in reversed(security_events)
         ]
         
-        recent_measurements = db.query(QuantumMeasurement).order_by(QuantumMeasurement.timestamp.desc()).limit(100).all()
+        recent_measurements = db.query(
+            QuantumMeasurement.timestamp, QuantumMeasurement.entropy_key, QuantumMeasurement.data_hash,
+            QuantumMeasurement.correlation, QuantumMeasurement.measurements
+        ).order_by(QuantumMeasurement.timestamp.desc()).limit(100).all()
         st.session_state.entropy_storage = [qm.entropy_key for qm in reversed(recent_measurements)]
         st.session_state.secure_data_store = [
             {
-                'timestamp': qm.timestamp.strftime("%H:%M:%S.%f")[:-3],
+                'timestamp': f"{qm.timestamp:%H:%M:%S}.{qm.timestamp.microsecond // 1000:03d}",
                 'entropy_key': qm.entropy_key,
                 'hash': qm.data_hash,
                 'correlation': qm.correlation,
@@ -81,15 +92,13 @@ if 'db_initialized' not in st.session_state:
             for qm in reversed(recent_measurements)
         ]
         
-        all_measurements = db.query(QuantumMeasurement).all()
-        measurements_dict = {'00': 0, '11': 0, 'other': 0}
-        for qm in all_measurements:
+        # Stream the history in batches instead of materializing every row
+        totals = Counter()
+        for qm in db.query(QuantumMeasurement.measurements).yield_per(1000):
             if qm.measurements:
-                for state, count in qm.measurements.items():
-                    if state in ['00', '11']:
-                        measurements_dict[state] += count
-                    else:
-                        measurements_dict['other'] += count
+                totals.update(qm.measurements)
+        measurements_dict = {'00': totals.pop('00', 0), '11': totals.pop('11', 0)}
+        measurements_dict['other'] = sum(totals.values())
         st.session_state.measurements = measurements_dict
         
         st.session_state.db_initialized = True
@@ -111,20 +120,49 @@ def create_bell_state():
     
     return qc
 
+def format_ms_timestamp():
+    """Current local time as HH:MM:SS.mmm using integer math on time_ns()"""
+    ns = time.time_ns()
+    ms = (ns // 1_000_000) % 1000
+    return f"{time.strftime('%H:%M:%S', time.localtime(ns // 1_000_000_000))}.{ms:03d}"
+
 def calculate_entropy(counts):
-    total = sum(counts.values())
-    entropy = 0
-    for count in counts.values():
-        if count > 0:
-            prob = count / total
-            entropy -= prob * np.log2(prob)
-    return entropy
+    # At most four outcomes for two qubits: one vectorized pass over the counts
+    values = np.fromiter(counts.values(), dtype=float, count=len(counts))
+    probabilities = values[values > 0] / values.sum()
+    return np.sum(probabilities * np.log2(1 / probabilities))
 
 def get_statevector(qc):
-    backend = Aer.get_backend('statevector_simulator')
-    result = backend.run(qc).result()
-    statevector = result.get_statevector()
-    return statevector
+    # A 2-qubit circuit is a handful of 4x4 products; evolve it directly in
+    # NumPy rather than submitting a simulator job
+    return Statevector.from_instruction(qc)
+
+def fig_to_svg(fig):
+    """Render a matplotlib figure to an SVG string and release it"""
+    buf = io.BytesIO()
+    fig.set_dpi(72)
+    fig.savefig(buf, format='svg')
+    plt.close(fig)
+    return str(buf.getbuffer(), 'utf-8')
+
+@st.cache_data(show_spinner=False)
+def render_bell_state_figures():
+    """Render the static Bell state visualizations once per process.
+
+    The circuit never changes between reruns, so the figures are rasterized
+    to SVG and the amplitudes formatted a single time instead of being
+    recomputed on every rerun.
+    """
+    qc = create_bell_state()
+    statevector = get_statevector(qc)
+    return {
+        'circuit': fig_to_svg(qc.draw(output='mpl', style='iqp')),
+        'state_city': fig_to_svg(plot_state_city(statevector)),
+        'bloch': fig_to_svg(plot_bloch_multivector(statevector)),
+        'amplitudes': "\n".join(
+            f"|{basis}⟩: {statevector[i]:.4f}" for i, basis in enumerate(('00', '01', '10', '11'))
+        ),
+    }
 
 def measure_quantum_state(qc):
     qr = qc.qregs[0]
@@ -133,8 +171,7 @@ def measure_quantum_state(qc):
     qc_measure = qc.copy()
     qc_measure.measure(qr, cr)
     
-    backend = Aer.get_backend('qasm_simulator')
-    job = backend.run(qc_measure, shots=1000)
+    job = QASM_BACKEND.run(qc_measure, shots=1000, max_parallel_threads=1)
     result = job.result()
     counts = result.get_counts()
     
@@ -155,8 +192,7 @@ def simulate_attack(qc):
     
     qc_attacked.measure(qr, cr)
     
-    backend = Aer.get_backend('qasm_simulator')
-    job = backend.run(qc_attacked, shots=1000)
+    job = QASM_BACKEND.run(qc_attacked, shots=1000, max_parallel_threads=1)
     result = job.result()
     counts = result.get_counts()
     
@@ -208,9 +244,7 @@ def upgrade_system():
     
     db = get_db()
     try:
-        sys_state = get_or_create_system_state(db)
-        sys_state.system_version = st.session_state.system_version
-        sys_state.last_updated = datetime.utcnow()
+        set_system_state(db, system_version=st.session_state.system_version)
         
         event = SecurityEvent(
             event_type='System Upgrade',
@@ -264,7 +298,7 @@ def classical_processing(measurement_results, is_attack_data=False):
         st.metric("Shannon Entropy", f"{entropy:.4f} bits")
         
         if not is_attack_data:
-            timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+            timestamp = format_ms_timestamp()
             store_quantum_data_with_entropy(measurement_results, timestamp)
             
             for state, count in measurement_results.items():
@@ -285,10 +319,7 @@ def auto_reset_system():
     
     db = get_db()
     try:
-        sys_state = get_or_create_system_state(db)
-        sys_state.total_resets = st.session_state.system_resets
-        sys_state.quantum_intact = True
-        sys_state.last_updated = datetime.utcnow()
+        set_system_state(db, total_resets=st.session_state.system_resets, quantum_intact=True)
         
         event = SecurityEvent(
             event_type='System Auto-Reset',
@@ -308,10 +339,9 @@ with col_left:
     st.subheader("⚛️ Quantum Circuit - Bell State Creation")
     
     qc = create_bell_state()
+    bell_figures = render_bell_state_figures()
     
-    fig = qc.draw(output='mpl', style='iqp')
-    st.pyplot(fig)
-    plt.close()
+    st.image(bell_figures['circuit'])
     
     st.markdown("""
     **Circuit Breakdown:**
@@ -341,21 +371,15 @@ col1, col2 = st.columns(2)
 with col1:
     st.subheader("📈 Quantum State Vector")
     
-    statevector = get_statevector(qc)
-    
-    fig_state = plot_state_city(statevector)
-    st.pyplot(fig_state)
-    plt.close()
+    st.image(bell_figures['state_city'])
     
     st.markdown("**Amplitudes:**")
-    st.code(f"|00⟩: {statevector[0]:.4f}\n|01⟩: {statevector[1]:.4f}\n|10⟩: {statevector[2]:.4f}\n|11⟩: {statevector[3]:.4f}")
+    st.code(bell_figures['amplitudes'])
 
 with col2:
     st.subheader("🎯 Bloch Sphere Representation")
     
-    fig_bloch = plot_bloch_multivector(statevector)
-    st.pyplot(fig_bloch)
-    plt.close()
+    st.image(bell_figures['bloch'])
 
 st.divider()
 
@@ -373,7 +397,7 @@ with col_attack:
         
         st.session_state.last_attack_results = attack_counts
         
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+        timestamp = format_ms_timestamp()
         attack_entropy = store_quantum_data_with_entropy(attack_counts, timestamp, is_attack=True)
         
         attack_reason = f'Eavesdropper introduced decoherence - Data secured with entropy {attack_entropy:.4f}'
@@ -385,7 +409,6 @@ with col_attack:
         
         db = get_db()
         try:
-            sys_state = get_or_create_system_state(db)
             event = SecurityEvent(
                 event_type='Attack Detected',
                 reason=attack_reason,
@@ -396,7 +419,7 @@ with col_attack:
             if detect_attack(attack_counts):
                 st.session_state.quantum_intact = False
                 st.session_state.under_attack = True
-                sys_state.quantum_intact = False
+                set_system_state(db, quantum_intact=False)
             
             db.commit()
         finally:
@@ -635,17 +658,32 @@ with threat_tab3:
     
     col_r1, col_r2, col_r3 = st.columns(3)
     
+    # Both counts cover the latest 100 rows and come back in one query
+    db = get_db()
+    try:
+        recent_threats = select(SecurityEvent.id).where(
+            SecurityEvent.event_type.like('%Ransomware%')
+        ).order_by(SecurityEvent.timestamp.desc()).limit(100).subquery()
+        recent_responses = select(AutomatedResponse.response_type).order_by(
+            AutomatedResponse.timestamp.desc()
+        ).limit(100).subquery()
+        ransom_count, backup_count = db.execute(select(
+            select(func.count()).select_from(recent_threats).scalar_subquery(),
+            select(func.count()).select_from(recent_responses).where(
+                recent_responses.c.response_type.in_(['File Backup', 'Emergency Backup'])
+            ).scalar_subquery()
+        )).one()
+    finally:
+        db.close()
+    
     with col_r1:
         st.metric("Protected Files", len(get_all_monitored_files()))
     
     with col_r2:
-        ransom_threats = ransomware_detector.get_recent_threats(100)
-        st.metric("Ransomware Blocks", len(ransom_threats))
+        st.metric("Ransomware Blocks", ransom_count)
     
     with col_r3:
-        responses = get_recent_automated_responses(100)
-        backups = [r for r in responses if r.response_type in ['File Backup', 'Emergency Backup']]
-        st.metric("Files Backed Up", len(backups))
+        st.metric("Files Backed Up", backup_count)
     
     st.markdown("**Ransomware Extension Protection:**")
     from ransomware_detector import RANSOMWARE_EXTENSIONS
@@ -1,8 +1,12 @@
 import os
+import atexit
 import logging
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, Text, JSON
+import queue
+import threading
+import time
+from sqlalchemy import create_engine, update, text, Index, Column, Integer, String, Float, DateTime, Boolean, Text, JSON
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, scoped_session, relationship
 from datetime import datetime
 
 # Configure logging
@@ -16,8 +20,19 @@ if not DATABASE_URL:
     DATABASE_URL = 'sqlite:///quantum_security.db'
     logger.warning("DATABASE_URL not set. Using SQLite fallback: quantum_security.db")
 
-engine = create_engine(DATABASE_URL)
+if DATABASE_URL.startswith('sqlite'):
+    engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+else:
+    # Keep warm connections around for the request handlers
+    engine = create_engine(DATABASE_URL, pool_size=10, max_overflow=20, pool_pre_ping=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Thread-scoped session for web request handlers; the app removes it on teardown.
+# Request handlers never reuse objects after commit, so skip expiring them:
+# reading the generated id afterwards needs no extra SELECT.
+db_session = scoped_session(
+    sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+)
 Base = declarative_base()
 
 class SecurityEvent(Base):
@@ -101,9 +116,49 @@ class AutomatedResponse(Base):
     target = Column(String(500))
     success = Column(Boolean, default=True)
     details = Column(JSON)
+    
+    # threat_id has no FK constraint in the schema, so the join is spelled out;
+    # assigning .threat lets the flush fill threat_id from the event's new id
+    threat = relationship(
+        SecurityEvent,
+        primaryjoin='foreign(AutomatedResponse.threat_id) == SecurityEvent.id'
+    )
+
+# Indexes backing the dashboard's polled queries. The API reads every log
+# table newest-first with a LIMIT, so each gets a descending timestamp index.
+Index('ix_security_events_timestamp_desc', SecurityEvent.timestamp.desc())
+Index('ix_monitored_files_active_checked', MonitoredFile.is_active, MonitoredFile.last_checked.desc())
+Index('ix_quantum_measurements_timestamp_desc', QuantumMeasurement.timestamp.desc())
+Index('ix_process_events_timestamp_desc', ProcessEvent.timestamp.desc())
+Index('ix_automated_responses_timestamp_desc', AutomatedResponse.timestamp.desc())
+# Suspicious processes are a small slice of the table; a partial index keeps
+# their filter + sort to a short range scan
+Index(
+    'ix_process_events_suspicious_partial',
+    ProcessEvent.timestamp.desc(),
+    postgresql_where=ProcessEvent.is_suspicious == True,
+    sqlite_where=ProcessEvent.is_suspicious == True
+)
+
+_db_initialized = False
+_db_init_lock = threading.Lock()
 
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    """Create missing tables and indexes, once per process"""
+    global _db_initialized
+    with _db_init_lock:
+        if _db_initialized:
+            return
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            # Earlier full (is_suspicious, timestamp) index, superseded by the
+            # partial index above
+            conn.execute(text('DROP INDEX IF EXISTS ix_process_events_suspicious_ts'))
+        # create_all() skips tables that already exist, including their new indexes
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
+        _db_initialized = True
 
 def get_db():
     db = SessionLocal()
@@ -120,3 +175,121 @@ def get_or_create_system_state(db):
         db.commit()
         db.refresh(state)
     return state
+
+# The Streamlit app and every web worker write this row, so a process's copy
+# is only trusted for a short TTL, like the API's response cache
+SYSTEM_STATE_TTL = 2.0  # seconds
+
+_system_state_cache = None
+_system_state_expires = 0.0
+_system_state_lock = threading.Lock()
+
+def get_system_state_snapshot(db=None):
+    """Return the system state as a dict, re-read at most every SYSTEM_STATE_TTL.
+
+    Other processes may have written the row since the last read, so the
+    cached copy is only a short-lived snapshot; set_system_state() keeps it
+    current for this process's own writes in between.
+    """
+    global _system_state_cache, _system_state_expires
+    with _system_state_lock:
+        if _system_state_cache is None or time.monotonic() >= _system_state_expires:
+            session = db if db is not None else get_db()
+            try:
+                state = get_or_create_system_state(session)
+                _system_state_cache = {
+                    'id': state.id,
+                    'system_version': state.system_version,
+                    'total_resets': state.total_resets,
+                    'quantum_intact': state.quantum_intact,
+                    'last_updated': state.last_updated
+                }
+                _system_state_expires = time.monotonic() + SYSTEM_STATE_TTL
+            finally:
+                if db is None:
+                    session.close()
+        return dict(_system_state_cache)
+
+def set_system_state(db, **values):
+    """Update the system state row in place without loading it first.
+
+    The caller owns the transaction, so the UPDATE can be committed together
+    with any events written alongside it.
+    """
+    values.setdefault('last_updated', datetime.utcnow())
+    result = db.execute(update(SystemState).values(**values))
+    if result.rowcount == 0:
+        db.add(SystemState(**values))
+    with _system_state_lock:
+        if _system_state_cache is not None:
+            _system_state_cache.update(values)
+
+
+# Background writer for log-only security events. Callers that don't need the
+# new row's id hand the event off here instead of committing in their own path.
+EVENT_BATCH_SIZE = 100
+EVENT_FLUSH_INTERVAL = 0.2  # seconds
+
+_event_queue = queue.Queue()
+_event_writer = None
+_event_writer_lock = threading.Lock()
+_event_listeners = []
+
+def add_event_listener(callback):
+    """Register a callback run after each batch of queued events is committed"""
+    _event_listeners.append(callback)
+
+def _write_events(batch):
+    db = SessionLocal()
+    try:
+        db.bulk_insert_mappings(SecurityEvent, batch)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Failed to write %d queued security events", len(batch))
+        return
+    finally:
+        db.close()
+    for callback in _event_listeners:
+        callback()
+
+def _event_writer_loop():
+    while True:
+        batch = [_event_queue.get()]
+        deadline = time.monotonic() + EVENT_FLUSH_INTERVAL
+        while len(batch) < EVENT_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_event_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        _write_events(batch)
+        for _ in batch:
+            _event_queue.task_done()
+
+def _ensure_event_writer():
+    # Started lazily so each forked worker gets its own thread
+    global _event_writer
+    if _event_writer is not None and _event_writer.is_alive():
+        return
+    with _event_writer_lock:
+        if _event_writer is None or not _event_writer.is_alive():
+            _event_writer = threading.Thread(
+                target=_event_writer_loop, name='security-event-writer', daemon=True
+            )
+            _event_writer.start()
+
+def log_security_event(**fields):
+    """Queue a SecurityEvent insert without waiting for the commit"""
+    fields.setdefault('timestamp', datetime.utcnow())
+    _ensure_event_writer()
+    _event_queue.put_nowait(fields)
+
+def flush_security_events():
+    """Block until every queued event has been written"""
+    if _event_writer is not None and _event_writer.is_alive():
+        _event_queue.join()
+
+atexit.register(flush_security_events)
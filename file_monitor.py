@@ -1,9 +1,26 @@
 import os
 import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from datetime import datetime
+from sqlalchemy import func
 from database import MonitoredFile, SecurityEvent, get_db
 
+# Active monitored files as returned by get_all_monitored_files(), tagged with
+# the table fingerprint they were loaded at. Writes from any process (this
+# one, the Flask API, its scans) move the fingerprint and force a reload.
+_monitored_cache = {'db_version': None, 'files': []}
+_monitored_cache_lock = threading.Lock()
+
+def _monitored_files_version(db):
+    """Cheap fingerprint of the active rows: adds, removals and scans all move it"""
+    return tuple(db.query(
+        func.count(MonitoredFile.id),
+        func.max(MonitoredFile.id),
+        func.max(MonitoredFile.last_checked)
+    ).filter(MonitoredFile.is_active == True).one())
+
 def calculate_file_entropy(file_path):
     try:
         with open(file_path, 'rb') as f:
@@ -20,16 +37,25 @@ def calculate_file_entropy(file_path):
     except Exception as e:
         return 0.0
 
-def calculate_file_hash(file_path):
+HASH_CHUNK_SIZE = 1 << 20
+
+def _hash_file(file_path, hasher):
     try:
-        sha256_hash = hashlib.sha256()
         with open(file_path, 'rb') as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+        return hasher.hexdigest()
     except Exception as e:
         return ""
 
+def calculate_file_hash(file_path):
+    # BLAKE2b-256: same 64-character hex digest as SHA-256, faster to compute
+    return _hash_file(file_path, hashlib.blake2b(digest_size=32))
+
+def calculate_legacy_file_hash(file_path):
+    # Files registered before the switch to BLAKE2b stored SHA-256 digests
+    return _hash_file(file_path, hashlib.sha256())
+
 def add_monitored_file(file_path):
     db = get_db()
     try:
@@ -53,32 +79,82 @@ def add_monitored_file(file_path):
     finally:
         db.close()
 
-def check_file_integrity(monitored_file):
-    current_hash = calculate_file_hash(monitored_file.file_path)
-    current_entropy = calculate_file_entropy(monitored_file.file_path)
+# file_path -> (hash, stat signature, entropy) from the last scan that found
+# the file intact. A file whose stat signature has not moved since is not
+# read again.
+_intact_files = {}
+
+def _stat_signature(file_path):
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    # ctime cannot be set from user space, so a content change that restores
+    # mtime still invalidates the entry
+    return (st.st_size, st.st_mtime_ns, st.st_ctime_ns, st.st_ino)
+
+def _check_integrity(file_path, last_hash, entropy_signature):
+    signature = _stat_signature(file_path)
+    cached = _intact_files.get(file_path)
+    if signature is not None and cached is not None and cached[:2] == (last_hash, signature):
+        current_hash, current_entropy = last_hash, cached[2]
+        return {
+            'hash_changed': False,
+            'entropy_drift': abs(current_entropy - entropy_signature),
+            'current_hash': current_hash,
+            'current_entropy': current_entropy,
+            'rehashed': False,
+            'compromised': False
+        }
+    
+    current_hash = calculate_file_hash(file_path)
+    current_entropy = calculate_file_entropy(file_path)
+    
+    hash_changed = current_hash != last_hash
+    # An unchanged file with a SHA-256 baseline only needs its hash upgraded
+    rehashed = hash_changed and calculate_legacy_file_hash(file_path) == last_hash
+    if rehashed:
+        hash_changed = False
+    entropy_drift = abs(current_entropy - entropy_signature)
+    compromised = hash_changed or entropy_drift > 0.5
     
-    hash_changed = current_hash != monitored_file.last_hash
-    entropy_drift = abs(current_entropy - monitored_file.entropy_signature)
+    if signature is not None and current_hash and not compromised:
+        _intact_files[file_path] = (current_hash, signature, current_entropy)
     
     return {
         'hash_changed': hash_changed,
         'entropy_drift': entropy_drift,
         'current_hash': current_hash,
         'current_entropy': current_entropy,
-        'compromised': hash_changed or entropy_drift > 0.5
+        'rehashed': rehashed,
+        'compromised': compromised
     }
 
+def check_file_integrity(monitored_file):
+    return _check_integrity(
+        monitored_file.file_path, monitored_file.last_hash, monitored_file.entropy_signature
+    )
+
 def scan_all_monitored_files():
     db = get_db()
     try:
-        files = db.query(MonitoredFile).filter_by(is_active=True).all()
+        files = [mf for mf in db.query(MonitoredFile).filter_by(is_active=True).all()
+                 if os.path.exists(mf.file_path)]
         results = []
         
-        for mf in files:
-            if not os.path.exists(mf.file_path):
-                continue
-            
-            integrity = check_file_integrity(mf)
+        # Hashing and entropy release the GIL, so files are checked in
+        # parallel; workers only see plain values, never the session's objects
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            checks = list(pool.map(
+                _check_integrity,
+                [mf.file_path for mf in files],
+                [mf.last_hash for mf in files],
+                [mf.entropy_signature for mf in files]
+            ))
+        
+        for mf, integrity in zip(files, checks):
+            if integrity['rehashed']:
+                mf.last_hash = integrity['current_hash']
             
             if integrity['compromised']:
                 mf.attack_count += 1
@@ -107,6 +183,13 @@ def scan_all_monitored_files():
 def get_all_monitored_files():
     db = get_db()
     try:
+        # The database round trips run outside the lock so concurrent page
+        # loads don't queue behind each other
+        db_version = _monitored_files_version(db)
+        with _monitored_cache_lock:
+            if _monitored_cache['db_version'] == db_version:
+                return list(_monitored_cache['files'])
+        
         files = db.query(MonitoredFile).filter_by(is_active=True).order_by(MonitoredFile.created_at.desc()).all()
         file_list = []
         for f in files:
@@ -117,9 +200,13 @@ def get_all_monitored_files():
                 'entropy_signature': f.entropy_signature,
                 'last_hash': f.last_hash
             })
-        return file_list
     finally:
         db.close()
+    
+    with _monitored_cache_lock:
+        _monitored_cache['files'] = file_list
+        _monitored_cache['db_version'] = db_version
+    return list(file_list)
 
 def remove_monitored_file(file_id):
     db = get_db()
@@ -4,8 +4,13 @@ SSL Certificate Generator for QuantumShield
 Generates self-signed SSL certificates for HTTPS
 """
 
-from OpenSSL import crypto
 import os
+import ipaddress
+from datetime import datetime, timedelta, timezone
+from cryptography import x509
+from cryptography.x509.oid import NameOID, ExtendedKeyUsageOID
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
 
 def generate_self_signed_cert(cert_dir="./ssl"):
     """
@@ -22,55 +27,94 @@ def generate_self_signed_cert(cert_dir="./ssl"):
         print(f"✅ SSL certificates already exist at {cert_dir}/")
         return cert_file, key_file
     
-    # Create key pair
-    key = crypto.PKey()
-    key.generate_key(crypto.TYPE_RSA, 4096)  # 4096-bit RSA key
+    # ECDSA P-256 matches RSA-3072 in strength and is generated in
+    # milliseconds instead of the seconds a 4096-bit RSA key takes
+    key = ec.generate_private_key(ec.SECP256R1())
     
     # Create certificate
-    cert = crypto.X509()
-    cert.get_subject().C = "US"
-    cert.get_subject().ST = "California"
-    cert.get_subject().L = "San Francisco"
-    cert.get_subject().O = "QuantumShield Security"
-    cert.get_subject().OU = "Security Division"
-    cert.get_subject().CN = "localhost"
-    
-    # Set serial number and validity
-    cert.set_serial_number(1000)
-    cert.gmtime_adj_notBefore(0)
-    cert.gmtime_adj_notAfter(365 * 24 * 60 * 60)  # Valid for 1 year
-    
-    # Set issuer and public key
-    cert.set_issuer(cert.get_subject())
-    cert.set_pubkey(key)
-    
-    # Add extensions for enhanced security
-    cert.add_extensions([
-        crypto.X509Extension(b"basicConstraints", False, b"CA:FALSE"),
-        crypto.X509Extension(b"keyUsage", False, b"digitalSignature, keyEncipherment"),
-        crypto.X509Extension(b"extendedKeyUsage", False, b"serverAuth"),
-        crypto.X509Extension(b"subjectAltName", False, b"DNS:localhost, DNS:127.0.0.1, IP:127.0.0.1"),
+    subject = issuer = x509.Name([
+        x509.NameAttribute(NameOID.COUNTRY_NAME, "US"),
+        x509.NameAttribute(NameOID.STATE_OR_PROVINCE_NAME, "California"),
+        x509.NameAttribute(NameOID.LOCALITY_NAME, "San Francisco"),
+        x509.NameAttribute(NameOID.ORGANIZATION_NAME, "QuantumShield Security"),
+        x509.NameAttribute(NameOID.ORGANIZATIONAL_UNIT_NAME, "Security Division"),
+        x509.NameAttribute(NameOID.COMMON_NAME, "localhost"),
     ])
+    now = datetime.now(timezone.utc)
     
-    # Sign certificate with private key
-    cert.sign(key, 'sha256')
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(subject)
+        .issuer_name(issuer)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + timedelta(days=365))  # Valid for 1 year
+        # Add extensions for enhanced security
+        .add_extension(x509.BasicConstraints(ca=False, path_length=None), critical=False)
+        .add_extension(x509.KeyUsage(
+            digital_signature=True, content_commitment=False, key_encipherment=False,
+            data_encipherment=False, key_agreement=False, key_cert_sign=False,
+            crl_sign=False, encipher_only=False, decipher_only=False
+        ), critical=False)
+        .add_extension(x509.ExtendedKeyUsage([ExtendedKeyUsageOID.SERVER_AUTH]), critical=False)
+        .add_extension(x509.SubjectAlternativeName([
+            x509.DNSName("localhost"),
+            x509.DNSName("127.0.0.1"),
+            x509.IPAddress(ipaddress.ip_address("127.0.0.1")),
+        ]), critical=False)
+        # Sign certificate with private key
+        .sign(key, hashes.SHA256())
+    )
     
     # Write certificate file
     with open(cert_file, "wb") as f:
-        f.write(crypto.dump_certificate(crypto.FILETYPE_PEM, cert))
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
     
     # Write private key file
     with open(key_file, "wb") as f:
-        f.write(crypto.dump_privatekey(crypto.FILETYPE_PEM, key))
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.TraditionalOpenSSL,
+            serialization.NoEncryption()
+        ))
     
     print(f"✅ SSL certificate generated successfully!")
     print(f"   Certificate: {cert_file}")
     print(f"   Private Key: {key_file}")
     print(f"   Valid for: 365 days")
-    print(f"   Key Size: 4096-bit RSA")
+    print(f"   Key: {describe_certificate_key(cert_file)}")
     
     return cert_file, key_file
 
 
+def certificate_key_info(cert_file="./ssl/cert.pem"):
+    """
+    Read the public key type and size of a PEM certificate
+    Returns: ('RSA' | 'ECDSA', key size in bits), or None if unreadable
+    """
+    try:
+        with open(cert_file, "rb") as f:
+            cert = x509.load_pem_x509_certificate(f.read())
+    except (OSError, ValueError):
+        return None
+    
+    public_key = cert.public_key()
+    if isinstance(public_key, rsa.RSAPublicKey):
+        return 'RSA', public_key.key_size
+    if isinstance(public_key, ec.EllipticCurvePublicKey):
+        return 'ECDSA', public_key.key_size
+    return type(public_key).__name__, getattr(public_key, 'key_size', None)
+
+
+def describe_certificate_key(cert_file="./ssl/cert.pem"):
+    """Human-readable key description such as '256-bit ECDSA'"""
+    info = certificate_key_info(cert_file)
+    if info is None:
+        return 'unknown'
+    key_type, key_size = info
+    return f"{key_size}-bit {key_type}"
+
+
 if __name__ == "__main__":
     generate_self_signed_cert()
@@ -0,0 +1,33 @@
+"""
+QuantumShield - Gunicorn configuration
+Usage: gunicorn -c gunicorn_conf.py flask_app:app
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Threaded workers let the database-bound API handlers overlap instead of
+# queueing behind each other
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Import the app once in the master so init_db(), the encryptor and the
+# precomputed response bodies are shared with every worker
+preload_app = True
+
+# Each open dashboard event stream holds one of its worker's threads for as
+# long as the page stays open (in place of that tab's polling requests), so
+# raise GUNICORN_THREADS when many dashboards are open at once
+timeout = 60
+keepalive = 5
+
+accesslog = '-'
+
+
+def post_fork(server, worker):
+    """Give each worker its own database connections instead of the master's"""
+    from database import engine
+    engine.dispose(close=False)
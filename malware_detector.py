@@ -1,6 +1,8 @@
 import psutil
 import os
+import re
 from datetime import datetime
+from functools import lru_cache
 from database import ProcessEvent, ThreatSignature, AutomatedResponse, get_db
 
 SUSPICIOUS_PROCESS_NAMES = [
@@ -8,6 +10,14 @@ SUSPICIOUS_PROCESS_NAMES = [
     'keylogger', 'rootkit', 'backdoor', 'exploit', 'payload'
 ]
 
+# All names in one pattern, so each process name is scanned once
+_SUSPICIOUS_NAME_RE = re.compile('|'.join(map(re.escape, SUSPICIOUS_PROCESS_NAMES)))
+
+@lru_cache(maxsize=1024)
+def is_suspicious_name(name):
+    # The same few hundred process names come back on every scan
+    return _SUSPICIOUS_NAME_RE.search(name.lower()) is not None
+
 RANSOMWARE_EXTENSIONS = [
     '.encrypted', '.locked', '.crypto', '.crypt', '.locky', '.cerber',
     '.zepto', '.odin', '.thor', '.aesir', '.zzzzz', '.micro', '.cryptowall',
@@ -26,7 +36,7 @@ def calculate_threat_score(process):
     try:
         cpu = process.cpu_percent(interval=0.1)
         memory = process.memory_percent()
-        name = process.name().lower()
+        name = process.name()
         
         if cpu > HIGH_CPU_THRESHOLD:
             score += 30.0
@@ -38,10 +48,8 @@ def calculate_threat_score(process):
         elif memory > 50.0:
             score += 10.0
         
-        for suspicious_name in SUSPICIOUS_PROCESS_NAMES:
-            if suspicious_name in name:
-                score += 50.0
-                break
+        if is_suspicious_name(name):
+            score += 50.0
         
         try:
             num_files = len(process.open_files())
@@ -4,6 +4,9 @@ from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
 from qiskit_aer import Aer
 import numpy as np
 
+# Looked up once; the simulator instance is reused for every run
+BACKEND = Aer.get_backend('qasm_simulator')
+
 def create_bell_state():
     print("\n" + "="*70)
     print("⚛️  QUANTUM BELL STATE: 1/√2 (|00⟩ + |11⟩)")
@@ -16,28 +19,35 @@ def create_bell_state():
     print("✅ Bell state created - qubits are now ENTANGLED")
     return qc
 
-def measure_normal(qc):
-    print("\n📊 NORMAL MEASUREMENT (No Attack):")
+def normal_circuit(qc):
     qc_copy = qc.copy()
     qc_copy.measure([0,1], [0,1])
-    backend = Aer.get_backend('qasm_simulator')
-    counts = backend.run(qc_copy, shots=1000).result().get_counts()
-    for state, count in sorted(counts.items()):
-        print(f"   |{state}⟩: {count} ({count/10:.1f}%)")
-    corr = (counts.get('00',0) + counts.get('11',0)) / 10
-    print(f"   Correlation: {corr:.1f}% ✅ SECURE")
-    return counts, corr
+    return qc_copy
 
-def simulate_attack(qc):
-    print("\n⚠️  ATTACK SIMULATION (Eavesdropper measures):")
+def attack_circuit(qc):
     qc_attack = qc.copy()
     qc_attack.measure(0, 0)  # COLLAPSE wave function!
     qc_attack.barrier()
     qc_attack.h(1)
     qc_attack.z(0)
     qc_attack.measure([0,1], [0,1])
-    backend = Aer.get_backend('qasm_simulator')
-    counts = backend.run(qc_attack, shots=1000).result().get_counts()
+    return qc_attack
+
+def run_circuits(circuits):
+    # One Aer job for all experiments; 2-qubit circuits don't benefit from Aer's thread pool
+    result = BACKEND.run(circuits, shots=1000, max_parallel_threads=1).result()
+    return [result.get_counts(i) for i in range(len(circuits))]
+
+def measure_normal(counts):
+    print("\n📊 NORMAL MEASUREMENT (No Attack):")
+    for state, count in sorted(counts.items()):
+        print(f"   |{state}⟩: {count} ({count/10:.1f}%)")
+    corr = (counts.get('00',0) + counts.get('11',0)) / 10
+    print(f"   Correlation: {corr:.1f}% ✅ SECURE")
+    return counts, corr
+
+def simulate_attack(counts):
+    print("\n⚠️  ATTACK SIMULATION (Eavesdropper measures):")
     for state, count in sorted(counts.items()):
         print(f"   |{state}⟩: {count} ({count/10:.1f}%)")
     corr = (counts.get('00',0) + counts.get('11',0)) / 10
@@ -52,8 +62,9 @@ print("   • Perfect correlation when measured together")
 print("   • Attack breaks entanglement → detectable!")
 
 bell = create_bell_state()
-normal_counts, normal_corr = measure_normal(bell)
-attack_counts, attack_corr = simulate_attack(bell)
+normal_results, attack_results = run_circuits([normal_circuit(bell), attack_circuit(bell)])
+normal_counts, normal_corr = measure_normal(normal_results)
+attack_counts, attack_corr = simulate_attack(attack_results)
 
 print("\n" + "="*70)
 print("📊 RESULTS:")
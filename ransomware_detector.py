@@ -1,159 +1,270 @@
 import os
 import time
+import itertools
+import threading
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from database import SecurityEvent, AutomatedResponse, MonitoredFile, get_db
+from file_monitor import calculate_file_hash
 import shutil
 
-RANSOMWARE_EXTENSIONS = [
+# Case-folded once so lookups against a lowered extension match every entry
+RANSOMWARE_EXTENSIONS = frozenset(ext.lower() for ext in [
     '.encrypted', '.locked', '.crypto', '.crypt', '.locky', '.cerber',
     '.zepto', '.odin', '.thor', '.aesir', '.zzzzz', '.micro', '.cryptowall',
     '.vault', '.xtbl', '.crinf', '.r5a', '.XRNT', '.XTBL', '.crypt', '.R16M01D05',
     '.pzdc', '.good', '.LOL!', '.OMG!', '.RDM', '.RRK', '.encryptedRSA',
     '.crjoker', '.LeChiffre', '.keybtc@inbox_com', '.0x0', '.bleep', '.1999',
     '.oxar', '.darkness', '.wcry', '.wncry', '.wnry', '.onion'
-]
+])
 
 RAPID_ENCRYPTION_THRESHOLD = 10
 TIME_WINDOW_SECONDS = 60
 
+# Scans are stat/read bound, and those calls release the GIL
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
 class RansomwareDetector:
     def __init__(self):
-        self.file_modification_tracker = defaultdict(list)
+        self.file_modification_tracker = defaultdict(deque)
         self.file_mtime_cache = {}
+        self.content_digest = {}
         self.backup_directory = '/tmp/quantum_security_backups'
+        self._stamp_second = None
+        self._stamp_text = ''
+        self._backup_counter = itertools.count()
+        # Scan workers share the trackers and the backup timestamp; hashing
+        # and copying happen outside it
+        self._state_lock = threading.Lock()
         os.makedirs(self.backup_directory, exist_ok=True)
     
     def check_file_extension(self, filepath):
         _, ext = os.path.splitext(filepath)
         return ext.lower() in RANSOMWARE_EXTENSIONS
     
-    def track_file_modification(self, filepath):
-        if not os.path.exists(filepath):
-            return 0
-        
+    def track_file_modification(self, filepath, mtime=None):
         try:
-            current_mtime = os.path.getmtime(filepath)
-            current_time = time.time()
+            # Scans pass the mtime from their directory entry; otherwise a
+            # single stat both checks existence and reads it
+            current_mtime = os.stat(filepath).st_mtime if mtime is None else mtime
             parent_dir = os.path.dirname(filepath)
             
-            if filepath in self.file_mtime_cache:
-                if current_mtime > self.file_mtime_cache[filepath]:
-                    self.file_modification_tracker[parent_dir].append(current_time)
-            else:
-                pass
-            
-            self.file_mtime_cache[filepath] = current_mtime
+            with self._state_lock:
+                previous_mtime = self.file_mtime_cache.get(filepath)
+                self.file_mtime_cache[filepath] = current_mtime
             
-            recent_modifications = [
-                t for t in self.file_modification_tracker[parent_dir]
-                if current_time - t <= TIME_WINDOW_SECONDS
-            ]
-            self.file_modification_tracker[parent_dir] = recent_modifications
+            if previous_mtime is None:
+                # Baseline digest on first sight, so the first touch of a
+                # file is compared against its real contents
+                digest = calculate_file_hash(filepath)
+                with self._state_lock:
+                    self.content_digest[filepath] = digest
+            elif current_mtime > previous_mtime:
+                # A newer mtime alone also fires on touch; only count it
+                # when the BLAKE2b digest shows the contents changed
+                digest = calculate_file_hash(filepath)
+                with self._state_lock:
+                    if digest != self.content_digest.get(filepath):
+                        # Stamped under the lock so each deque stays in time order
+                        self.file_modification_tracker[parent_dir].append(time.time())
+                    self.content_digest[filepath] = digest
             
-            return len(recent_modifications)
+            with self._state_lock:
+                return self._recent_modifications(parent_dir, time.time())
         except Exception:
             return 0
     
+    def _recent_modifications(self, directory, current_time):
+        # Caller holds _state_lock. Timestamps are appended in order, so expired ones are always at the
+        # left end and each is popped at most once
+        modifications = self.file_modification_tracker[directory]
+        while modifications and current_time - modifications[0] > TIME_WINDOW_SECONDS:
+            modifications.popleft()
+        return len(modifications)
+    
     def detect_rapid_encryption(self, directory):
-        if directory not in self.file_modification_tracker:
-            return False
-        
-        current_time = time.time()
-        recent_modifications = [
-            t for t in self.file_modification_tracker[directory]
-            if current_time - t <= TIME_WINDOW_SECONDS
-        ]
+        with self._state_lock:
+            if directory not in self.file_modification_tracker:
+                return False
+            
+            return self._recent_modifications(directory, time.time()) >= RAPID_ENCRYPTION_THRESHOLD
+    
+    def create_backup(self, filepath, db=None):
+        backup_path = self._copy_to_backup(filepath)
+        if backup_path is None:
+            return None
         
-        return len(recent_modifications) >= RAPID_ENCRYPTION_THRESHOLD
+        try:
+            # A scan passes its own session and commits once at the end
+            session = db if db is not None else get_db()
+            try:
+                self._record_backup(session, filepath, backup_path)
+                if db is None:
+                    session.commit()
+            finally:
+                if db is None:
+                    session.close()
+            
+            return backup_path
+        except Exception as e:
+            return None
     
-    def create_backup(self, filepath):
-        if not os.path.exists(filepath):
+    def _copy_to_backup(self, filepath):
+        try:
+            st = os.stat(filepath)
+        except OSError:
             return None
         
         try:
             filename = os.path.basename(filepath)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_filename = f"{timestamp}_{filename}"
+            # A counter keeps names unique within the second, so bursts of
+            # backups don't overwrite each other
+            backup_filename = f"{self._backup_timestamp()}_{next(self._backup_counter)}_{filename}"
             backup_path = os.path.join(self.backup_directory, backup_filename)
             
-            shutil.copy2(filepath, backup_path)
-            
-            db = get_db()
-            try:
-                response = AutomatedResponse(
-                    response_type='File Backup',
-                    action_taken=f'Created backup of {filename} before potential encryption',
-                    target=filepath,
-                    success=True,
-                    details={'backup_path': backup_path, 'original': filepath}
-                )
-                db.add(response)
-                db.commit()
-            finally:
-                db.close()
-            
+            # copyfile copies in the kernel (sendfile) on Linux; of the
+            # metadata copy2 would add, only the timestamps are worth keeping
+            shutil.copyfile(filepath, backup_path)
+            os.utime(backup_path, ns=(st.st_atime_ns, st.st_mtime_ns))
             return backup_path
         except Exception as e:
             return None
     
+    def _record_backup(self, session, filepath, backup_path):
+        session.add(AutomatedResponse(
+            response_type='File Backup',
+            action_taken=f'Created backup of {os.path.basename(filepath)} before potential encryption',
+            target=filepath,
+            success=True,
+            details={'backup_path': backup_path, 'original': filepath}
+        ))
+    
+    def _backup_timestamp(self):
+        # Bursts of backups land in the same second; format it only once.
+        # The lock keeps the second and its text paired across scan workers.
+        second = int(time.time())
+        with self._state_lock:
+            if second != self._stamp_second:
+                self._stamp_text = time.strftime("%Y%m%d_%H%M%S", time.localtime(second))
+                self._stamp_second = second
+            return self._stamp_text
+    
+    def _iter_files(self, directory):
+        """Yield a DirEntry for every file below directory, without following links to directories"""
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            # Unreadable directories are skipped, as os.walk does
+            return
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self._iter_files(entry.path)
+                elif not entry.is_dir():
+                    # A link to a directory is neither walked nor scanned, as
+                    # with os.walk
+                    yield entry
+    
     def scan_directory_for_ransomware(self, directory):
         threats_found = []
         
-        if not os.path.exists(directory):
+        try:
+            with os.scandir(directory) as entries:
+                top_level = list(entries)
+        except OSError:
             return threats_found
         
+        # Files directly in the directory are checked here; each subtree is
+        # independent (its own files and parent directories), so they are
+        # walked on a thread pool
+        subtrees = [entry.path for entry in top_level if entry.is_dir(follow_symlinks=False)]
+        # is_dir() follows links, so links to directories are skipped here too
+        results = [self._scan_entries(entry for entry in top_level if not entry.is_dir())]
+        if subtrees:
+            with ThreadPoolExecutor(max_workers=min(SCAN_WORKERS, len(subtrees))) as pool:
+                results.extend(pool.map(lambda path: self._scan_entries(self._iter_files(path)), subtrees))
+        
+        backups = []
+        for threats, copied in results:
+            threats_found.extend(threats)
+            backups.extend(copied)
+        
+        # One session for the whole pass, used from this thread only; it only
+        # checks out a connection once a backup or detection is written
+        db = get_db()
         try:
-            for root, dirs, files in os.walk(directory):
-                for filename in files:
-                    filepath = os.path.join(root, filename)
-                    
-                    if self.check_file_extension(filepath):
-                        threats_found.append({
-                            'type': 'Ransomware Extension',
-                            'file': filepath,
-                            'severity': 'CRITICAL',
-                            'details': f'Suspicious ransomware extension detected: {os.path.splitext(filepath)[1]}'
-                        })
-                    
-                    num_mods = self.track_file_modification(filepath)
-                    if num_mods >= RAPID_ENCRYPTION_THRESHOLD:
-                        self.create_backup(filepath)
-                        threats_found.append({
-                            'type': 'Rapid Encryption',
-                            'file': filepath,
-                            'severity': 'CRITICAL',
-                            'details': f'Detected {num_mods} modifications in {TIME_WINDOW_SECONDS} seconds'
-                        })
+            for filepath, backup_path in backups:
+                self._record_backup(db, filepath, backup_path)
+            if threats_found:
+                self.log_ransomware_detection(threats_found, db)
+            db.commit()
+        finally:
+            db.close()
+        
+        return threats_found
+    
+    def _scan_entries(self, entries):
+        """Check directory entries; returns (threats, [(file, backup path)])"""
+        threats_found = []
+        backups = []
+        try:
+            for entry in entries:
+                filepath = entry.path
+                
+                if self.check_file_extension(filepath):
+                    threats_found.append({
+                        'type': 'Ransomware Extension',
+                        'file': filepath,
+                        'severity': 'CRITICAL',
+                        'details': f'Suspicious ransomware extension detected: {os.path.splitext(filepath)[1]}'
+                    })
+                
+                try:
+                    mtime = entry.stat().st_mtime
+                except OSError:
+                    continue
+                num_mods = self.track_file_modification(filepath, mtime)
+                if num_mods >= RAPID_ENCRYPTION_THRESHOLD:
+                    # Copy right away; the database record is written later
+                    # by the scanning thread
+                    backup_path = self._copy_to_backup(filepath)
+                    if backup_path:
+                        backups.append((filepath, backup_path))
+                    threats_found.append({
+                        'type': 'Rapid Encryption',
+                        'file': filepath,
+                        'severity': 'CRITICAL',
+                        'details': f'Detected {num_mods} modifications in {TIME_WINDOW_SECONDS} seconds'
+                    })
         
         except Exception as e:
             pass
         
-        if threats_found:
-            self.log_ransomware_detection(threats_found)
-        
-        return threats_found
+        return threats_found, backups
     
-    def log_ransomware_detection(self, threats):
-        db = get_db()
+    def log_ransomware_detection(self, threats, db=None):
+        session = db if db is not None else get_db()
         try:
-            for threat in threats:
-                event = SecurityEvent(
-                    event_type='Ransomware Detected',
-                    reason=f"{threat['type']}: {threat['details']}",
-                    system_version=1
-                )
-                db.add(event)
+            # One executemany for the whole scan instead of a flush per event
+            session.bulk_insert_mappings(SecurityEvent, [{
+                'event_type': 'Ransomware Detected',
+                'reason': f"{threat['type']}: {threat['details']}",
+                'system_version': 1
+            } for threat in threats])
             
-            db.commit()
+            if db is None:
+                session.commit()
         finally:
-            db.close()
+            if db is None:
+                session.close()
     
     def monitor_monitored_files(self):
         db = get_db()
         try:
             monitored_files = db.query(MonitoredFile).filter_by(is_active=True).all()
             threats = []
+            responses = []
             
             for mf in monitored_files:
                 if self.check_file_extension(mf.file_path):
@@ -164,20 +275,21 @@ class RansomwareDetector:
                         'details': f'Monitored file has been encrypted: {mf.file_path}'
                     })
                     
-                    backup_path = self.create_backup(mf.file_path)
+                    backup_path = self.create_backup(mf.file_path, db)
                     
                     if backup_path:
-                        response = AutomatedResponse(
-                            response_type='Emergency Backup',
-                            action_taken=f'Emergency backup created for monitored file',
-                            target=mf.file_path,
-                            success=True,
-                            details={'backup': backup_path}
-                        )
-                        db.add(response)
+                        responses.append({
+                            'response_type': 'Emergency Backup',
+                            'action_taken': f'Emergency backup created for monitored file',
+                            'target': mf.file_path,
+                            'success': True,
+                            'details': {'backup': backup_path}
+                        })
             
             if threats:
-                self.log_ransomware_detection(threats)
+                self.log_ransomware_detection(threats, db)
+                if responses:
+                    db.bulk_insert_mappings(AutomatedResponse, responses)
                 db.commit()
             
             return threats
@@ -0,0 +1,94 @@
+"""
+QuantumShield - API Request Schemas
+Typed request bodies for the Flask API, validated in a single pass
+"""
+
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Optional, Union, get_args, get_origin
+
+
+class RequestValidationError(ValueError):
+    """Raised when a request body does not match its schema"""
+
+
+@dataclass(slots=True)
+class CreateEventRequest:
+    event_type: Optional[str] = None
+    reason: Optional[str] = None
+    entropy: Optional[float] = None
+    correlation: Optional[float] = None
+    # null has always been accepted and stored as-is
+    system_version: Optional[int] = 1
+
+
+@dataclass(slots=True)
+class AddFileRequest:
+    file_path: Optional[str] = None
+
+
+@dataclass(slots=True)
+class CreateMeasurementRequest:
+    entropy_key: Optional[float] = None
+    data_hash: Optional[int] = None
+    correlation: Optional[float] = None
+    measurements: Optional[dict] = None
+    # Clients send 0/1 as well as true/false; the handler coerces to bool
+    is_attack: Optional[Union[bool, int]] = False
+
+
+@dataclass(slots=True)
+class SystemStateUpdateRequest:
+    system_version: Optional[int] = None
+    total_resets: Optional[int] = None
+    quantum_intact: Optional[bool] = None
+
+
+@dataclass(slots=True)
+class SimulateAttackRequest:
+    attack_type: str = 'ransomware'
+
+
+@dataclass(slots=True)
+class EncryptRequest:
+    data: Optional[str] = None
+
+
+@dataclass(slots=True)
+class CheckAnswerRequest:
+    scenario_id: Optional[int] = None
+    answer: Optional[str] = None
+
+
+@lru_cache(maxsize=None)
+def _schema_fields(schema):
+    """(name, accepted types) for each field, worked out once per schema"""
+    compiled = []
+    for field in fields(schema):
+        annotation = field.type
+        accepted = get_args(annotation) if get_origin(annotation) is Union else (annotation,)
+        if float in accepted:
+            # JSON does not distinguish 1 from 1.0
+            accepted += (int,)
+        compiled.append((field.name, accepted))
+    return tuple(compiled)
+
+
+def parse_body(schema, data):
+    """
+    Build a schema instance from a decoded JSON body
+    Returns: the instance; raises RequestValidationError on a type mismatch
+    """
+    if not isinstance(data, dict):
+        raise RequestValidationError('request body must be a JSON object')
+
+    values = {}
+    for name, accepted in _schema_fields(schema):
+        if name not in data:
+            continue
+        value = data[name]
+        # bool is an int subclass, so only accept it where bool is declared
+        if not isinstance(value, accepted) or (isinstance(value, bool) and bool not in accepted):
+            raise RequestValidationError(f'{name} has an invalid type')
+        values[name] = value
+    return schema(**values)
@@ -5,24 +5,176 @@ Provides military-grade encryption for data at rest and in transit
 
 import os
 import base64
+import binascii
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import hashes, padding
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
+logger = logging.getLogger(__name__)
+
+
+def _cpu_flags():
+    """
+    CPU feature flags of the first core
+    Returns: set of flag names from /proc/cpuinfo, or None when it cannot be read
+    """
+    try:
+        with open('/proc/cpuinfo') as cpuinfo:
+            for line in cpuinfo:
+                # x86 lists 'flags', ARM lists 'Features'
+                if line.startswith(('flags', 'Features')):
+                    return set(line.split(':', 1)[1].split())
+    except OSError:
+        return None
+    return None
+
+
+def detect_aes_ni():
+    """
+    Report whether the CPU advertises AES instructions
+    Returns: True/False from /proc/cpuinfo, or None when it cannot be read
+    """
+    flags = _cpu_flags()
+    return None if flags is None else 'aes' in flags
+
+
+def detect_sha_ni():
+    """
+    Report whether the CPU advertises SHA-256 instructions
+    Returns: True/False from /proc/cpuinfo, or None when it cannot be read
+    """
+    flags = _cpu_flags()
+    # x86 SHA extensions are 'sha_ni', the ARMv8 crypto extension is 'sha2'
+    return None if flags is None else bool(flags & {'sha_ni', 'sha2'})
+
+
+def _log_aes_backend():
+    """Log which AES implementation encryption will run on"""
+    backend = default_backend()
+    if not backend.cipher_supported(algorithms.AES(bytes(32)), modes.GCM(bytes(GCM_NONCE_SIZE))):
+        logger.warning("OpenSSL backend does not support AES-256-GCM")
+        return
+    if AES_NI_AVAILABLE is None:
+        accel = 'unknown'
+    else:
+        accel = 'AES-NI available' if AES_NI_AVAILABLE else 'no AES-NI, software AES'
+    logger.info("AES-256 via %s (%s)", backend.openssl_version_text(), accel)
+
+
+def _log_hash_backend():
+    """Log whether hashlib's SHA-256 can use the CPU's SHA instructions"""
+    # hashlib falls back to its bundled C implementation when it is built
+    # without OpenSSL, and that one has no SHA-NI code path
+    openssl = hashlib.sha256.__name__ == 'openssl_sha256'
+    if SHA_NI_AVAILABLE is None:
+        accel = 'unknown'
+    else:
+        accel = 'SHA-NI available' if SHA_NI_AVAILABLE else 'no SHA-NI'
+    if openssl:
+        logger.info("SHA-256 via OpenSSL (%s)", accel)
+    else:
+        logger.warning("SHA-256 via hashlib's built-in implementation (%s); file hashing will be slower", accel)
+
+
+# Legacy PBKDF2 keys kept per AESEncryption instance, keyed by salt
+KEY_CACHE_SIZE = 256
+
+# Header of HKDF-keyed GCM envelopes. Three bytes, so the base64 text of every
+# such envelope starts with the same four characters. Envelopes without one
+# are from before the header existed and use PBKDF2 with CBC.
+ENVELOPE_HKDF_GCM = b'QS\x02'
+GCM_NONCE_SIZE = 12
+
+# What encrypt() output can look like: a headered envelope's base64 prefix,
+# or a legacy one at least salt + IV + one block long
+_ENVELOPE_PREFIX = base64.b64encode(ENVELOPE_HKDF_GCM).decode('ascii')
+_LEGACY_MIN_BYTES = 48
+_LEGACY_MIN_TEXT = _LEGACY_MIN_BYTES * 4 // 3
+
+AES_NI_AVAILABLE = detect_aes_ni()
+SHA_NI_AVAILABLE = detect_sha_ni()
+_log_aes_backend()
+_log_hash_backend()
+
+
+def _is_legacy_shaped(data):
+    # salt + IV + at least one block, and CBC output is whole blocks
+    return len(data) >= _LEGACY_MIN_BYTES and len(data) % 16 == 0
+
+
+def _seal(aead, prefix, nonce, plaintext):
+    """Encrypt one message into a GCM envelope: prefix (header + salt) + nonce + ciphertext"""
+    # GCM needs no padding and appends a 16-byte authentication tag;
+    # the envelope is assembled in a single allocation
+    return b''.join((prefix, nonce, aead.encrypt(nonce, plaintext, None)))
+
+
+def _b64(data):
+    # b2a_base64 encodes in one C call, skipping b64encode's wrapper
+    return binascii.b2a_base64(data, newline=False).decode('ascii')
+
+
 class AESEncryption:
-    """AES-256 encryption handler with PBKDF2 key derivation"""
+    """AES-256 encryption handler with HKDF key derivation"""
     
     def __init__(self, master_key=None):
         """Initialize with master key or generate one"""
         if master_key is None:
             # Generate secure random master key
-            master_key = os.environ.get('QUANTUM_MASTER_KEY', base64.b64encode(os.urandom(32)).decode())
+            master_key = os.environ.get('QUANTUM_MASTER_KEY', base64.b64encode(os.urandom(32)).decode('ascii'))
         
         self.master_key = master_key.encode() if isinstance(master_key, str) else master_key
+        
+        # One key per instance; the salt still travels with every ciphertext
+        self._key_cache = OrderedDict()
+        self._key_cache_lock = threading.Lock()
+        self._salt = os.urandom(16)
+        self._key = self.derive_key(self._salt)
+        # The AEAD object holds the expanded key schedule; build it once
+        self._aead = AESGCM(self._key)
+        # Header and salt open every envelope this instance seals
+        self._envelope_prefix = ENVELOPE_HKDF_GCM + self._salt
+    
+    def begin(self):
+        """
+        Start an encryption context with its own fresh salt and key
+        Returns: EncryptionContext; its output decrypts with this instance
+        """
+        salt = os.urandom(16)
+        return EncryptionContext(salt, AESGCM(self.derive_key(salt)))
     
     def derive_key(self, salt):
-        """Derive encryption key using PBKDF2"""
+        """Derive encryption key using HKDF (extract + expand) with the salt"""
+        # The master key may be any string, including QUANTUM_MASTER_KEY set
+        # to a passphrase, so it goes through HKDF's extract step rather than
+        # being used as key material directly. HKDF does no stretching: a
+        # low-entropy passphrase needs a random generated key instead.
+        hkdf = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,  # 256 bits
+            salt=bytes(salt),
+            info=b'quantumshield-aes',
+            backend=default_backend()
+        )
+        return hkdf.derive(self.master_key)
+    
+    def derive_legacy_key(self, salt):
+        """Derive a pre-HKDF encryption key using PBKDF2, once per salt"""
+        salt = bytes(salt)
+        with self._key_cache_lock:
+            key = self._key_cache.get(salt)
+            if key is not None:
+                self._key_cache.move_to_end(salt)
+                return key
+        
+        # Derived outside the lock so other threads' lookups aren't held up
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=32,  # 256 bits
@@ -30,55 +182,76 @@ class AESEncryption:
             iterations=100000,
             backend=default_backend()
         )
-        return kdf.derive(self.master_key)
+        key = kdf.derive(self.master_key)
+        with self._key_cache_lock:
+            self._key_cache[salt] = key
+            if len(self._key_cache) > KEY_CACHE_SIZE:
+                # Evict the least recently used salt
+                self._key_cache.popitem(last=False)
+        return key
     
     def encrypt(self, plaintext):
         """
-        Encrypt data using AES-256-CBC
-        Returns: base64-encoded encrypted data with IV and salt
+        Encrypt data using AES-256-GCM
+        Returns: base64-encoded encrypted data with nonce and salt
+        """
+        return _b64(self.encrypt_raw(plaintext))
+    
+    def encrypt_raw(self, plaintext):
+        """
+        Encrypt data using AES-256-GCM, for binary storage
+        Returns: encrypted bytes with nonce and salt
         """
         if isinstance(plaintext, str):
             plaintext = plaintext.encode('utf-8')
         
-        # Generate random salt and IV
-        salt = os.urandom(16)
-        iv = os.urandom(16)
-        
-        # Derive encryption key
-        key = self.derive_key(salt)
-        
-        # Pad plaintext to block size
-        padder = padding.PKCS7(128).padder()
-        padded_data = padder.update(plaintext) + padder.finalize()
-        
-        # Encrypt
-        cipher = Cipher(
-            algorithms.AES(key),
-            modes.CBC(iv),
-            backend=default_backend()
-        )
-        encryptor = cipher.encryptor()
-        ciphertext = encryptor.update(padded_data) + encryptor.finalize()
-        
-        # Combine salt + IV + ciphertext and encode
-        encrypted_data = salt + iv + ciphertext
-        return base64.b64encode(encrypted_data).decode('utf-8')
+        # Fresh nonce per message with the instance's pre-derived key
+        return _seal(self._aead, self._envelope_prefix, os.urandom(GCM_NONCE_SIZE), plaintext)
     
     def decrypt(self, encrypted_data):
         """
-        Decrypt AES-256-CBC encrypted data
+        Decrypt AES-256-GCM (or older AES-256-CBC) encrypted data
         Returns: decrypted plaintext
         """
         # Decode from base64
-        encrypted_bytes = base64.b64decode(encrypted_data)
+        return self.decrypt_raw(base64.b64decode(encrypted_data))
+    
+    def decrypt_raw(self, encrypted_bytes):
+        """
+        Decrypt bytes produced by encrypt_raw (or the decoded form of encrypt)
+        Returns: decrypted plaintext
+        """
+        encrypted_bytes = bytes(encrypted_bytes)
+        header = encrypted_bytes[:len(ENVELOPE_HKDF_GCM)]
+        body = encrypted_bytes[len(ENVELOPE_HKDF_GCM):]
+        if header == ENVELOPE_HKDF_GCM:
+            # No legacy retry when the tag fails: a tampered or foreign value
+            # must not cost a PBKDF2 run. A legacy envelope whose random salt
+            # happens to begin with the header (a 2^-24 chance) is given up.
+            return self._decrypt_gcm(body)
+        if not _is_legacy_shaped(encrypted_bytes):
+            raise ValueError("Not an encrypted envelope")
+        return self._decrypt_cbc(encrypted_bytes)
+    
+    def _decrypt_gcm(self, encrypted_bytes):
+        # Extract components
+        salt = encrypted_bytes[:16]
+        nonce = encrypted_bytes[16:16 + GCM_NONCE_SIZE]
+        ciphertext = encrypted_bytes[16 + GCM_NONCE_SIZE:]
         
+        # Raises InvalidTag if the data was altered or the key is wrong
+        aead = self._aead if salt == self._salt else AESGCM(self.derive_key(salt))
+        plaintext = aead.decrypt(nonce, ciphertext, None)
+        return plaintext.decode('utf-8')
+    
+    def _decrypt_cbc(self, encrypted_bytes):
+        # Pre-header envelopes: PBKDF2 key, AES-256-CBC with PKCS7 padding
         # Extract components
         salt = encrypted_bytes[:16]
         iv = encrypted_bytes[16:32]
         ciphertext = encrypted_bytes[32:]
         
-        # Derive decryption key
-        key = self.derive_key(salt)
+        key = self.derive_legacy_key(salt)
         
         # Decrypt
         cipher = Cipher(
@@ -95,33 +268,77 @@ class AESEncryption:
         
         return plaintext.decode('utf-8')
     
-    def encrypt_dict(self, data):
-        """Encrypt dictionary values"""
-        encrypted = {}
-        for key, value in data.items():
-            if value is not None:
-                encrypted[key] = self.encrypt(str(value))
-            else:
-                encrypted[key] = None
+    def encrypt_dict(self, data, raw=False):
+        """Encrypt dictionary values; raw=True keeps them as bytes for binary columns"""
+        # Every value shares the instance key; draw all nonces in one call
+        present = [key for key, value in data.items() if value is not None]
+        nonces = os.urandom(GCM_NONCE_SIZE * len(present))
+        
+        encrypted = dict.fromkeys(data)
+        for i, key in enumerate(present):
+            nonce = nonces[i * GCM_NONCE_SIZE:(i + 1) * GCM_NONCE_SIZE]
+            sealed = _seal(self._aead, self._envelope_prefix, nonce, str(data[key]).encode('utf-8'))
+            encrypted[key] = sealed if raw else _b64(sealed)
         return encrypted
     
     def decrypt_dict(self, encrypted_data):
         """Decrypt dictionary values"""
         decrypted = {}
         for key, value in encrypted_data.items():
-            if value is not None:
+            if value is not None and not self._could_be_envelope(value):
+                # Plainly not ciphertext; skip the failing decrypt and its exception
+                decrypted[key] = value
+            elif value is not None:
                 try:
-                    decrypted[key] = self.decrypt(value)
+                    if isinstance(value, (bytes, bytearray, memoryview)):
+                        decrypted[key] = self.decrypt_raw(value)
+                    else:
+                        decrypted[key] = self.decrypt(value)
                 except:
                     decrypted[key] = value  # Return as-is if decryption fails
             else:
                 decrypted[key] = None
         return decrypted
+    
+    def _could_be_envelope(self, value):
+        if isinstance(value, str):
+            return value.startswith(_ENVELOPE_PREFIX) or (
+                len(value) >= _LEGACY_MIN_TEXT and len(value) % 4 == 0
+            )
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return len(value) >= _LEGACY_MIN_BYTES
+        # decrypt() only accepts text or bytes
+        return False
+
+
+class EncryptionContext:
+    """One derived key and AESGCM object shared by many encryptions"""
+    
+    def __init__(self, salt, aead):
+        self._aead = aead
+        self._envelope_prefix = ENVELOPE_HKDF_GCM + salt
+    
+    def encrypt_raw(self, plaintext):
+        """
+        Encrypt data using AES-256-GCM under this context's key
+        Returns: encrypted bytes with nonce and salt
+        """
+        if isinstance(plaintext, str):
+            plaintext = plaintext.encode('utf-8')
+        # Only the nonce changes between messages
+        return _seal(self._aead, self._envelope_prefix, os.urandom(GCM_NONCE_SIZE), plaintext)
+    
+    def encrypt(self, plaintext):
+        """
+        Encrypt data using AES-256-GCM under this context's key
+        Returns: base64-encoded encrypted data with nonce and salt
+        """
+        return _b64(self.encrypt_raw(plaintext))
 
 
 def generate_encryption_key():
     """Generate a new secure encryption key"""
-    return base64.b64encode(os.urandom(32)).decode()
+    return base64.b64encode(os.urandom(32)).decode('ascii')
 
 
 def test_encryption():
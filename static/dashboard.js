@@ -0,0 +1,417 @@
+async function loadDashboard() {
+    // Load security info
+    try {
+        const secInfo = await fetch('/api/security/info').then(r => r.json());
+        document.getElementById('securityInfo').innerHTML = `
+            <h2>🔐 Active Security Measures</h2>
+            <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 15px;">
+                <div>
+                    <h3>🔒 Encryption</h3>
+                    <p><strong>Algorithm:</strong> ${secInfo.encryption.algorithm}</p>
+                    <p><strong>Key Size:</strong> ${secInfo.encryption.key_size} bits</p>
+                    <p><strong>Mode:</strong> ${secInfo.encryption.mode}</p>
+                    <p><strong>KDF:</strong> ${secInfo.encryption.key_derivation}</p>
+                </div>
+                <div>
+                    <h3>🔐 SSL/TLS</h3>
+                    <p><strong>Status:</strong> ${secInfo.ssl.enabled ? '✅ ENABLED' : '❌ DISABLED'}</p>
+                    <p><strong>Protocol:</strong> ${secInfo.ssl.protocol}</p>
+                    <p><strong>Key Size:</strong> ${secInfo.ssl.key_size} bits</p>
+                    <p><strong>Type:</strong> ${secInfo.ssl.certificate_type}</p>
+                </div>
+            </div>
+        `;
+    } catch (e) {
+        console.error('Failed to load security info:', e);
+    }
+
+    // Load stats
+    const stats = await fetch('/api/stats').then(r => r.json());
+    document.getElementById('stats').innerHTML = `
+        <div class="stat-card">
+            <div class="stat-value">${stats.total_events}</div>
+            <div class="stat-label">Total Security Events</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-value">${stats.monitored_files}</div>
+            <div class="stat-label">Monitored Files</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-value">${stats.suspicious_processes}</div>
+            <div class="stat-label">Suspicious Processes</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-value">${stats.quantum_measurements}</div>
+            <div class="stat-label">Quantum Measurements</div>
+        </div>
+    `;
+
+    // Load recent events
+    const events = await fetch('/api/events/recent').then(r => r.json());
+    document.getElementById('events').innerHTML = `
+        <table>
+            <thead>
+                <tr>
+                    <th>Timestamp</th>
+                    <th>Type</th>
+                    <th>Reason</th>
+                    <th>Entropy</th>
+                </tr>
+            </thead>
+            <tbody>
+                ${events.map(e => `
+                    <tr>
+                        <td>${new Date(e.ts).toLocaleString()}</td>
+                        <td>${e.event_type}</td>
+                        <td>${e.reason}</td>
+                        <td>${e.entropy ? e.entropy.toFixed(4) : 'N/A'}</td>
+                    </tr>
+                `).join('')}
+            </tbody>
+        </table>
+    `;
+
+    // Load monitored files
+    const files = await fetch('/api/files/monitored').then(r => r.json());
+    document.getElementById('files').innerHTML = `
+        <table>
+            <thead>
+                <tr>
+                    <th>File Path</th>
+                    <th>Status</th>
+                    <th>Last Checked</th>
+                    <th>Attack Count</th>
+                </tr>
+            </thead>
+            <tbody>
+                ${files.map(f => `
+                    <tr>
+                        <td>${f.file_path}</td>
+                        <td class="${f.is_active ? 'status-active' : 'status-inactive'}">
+                            ${f.is_active ? 'Active' : 'Inactive'}
+                        </td>
+                        <td>${new Date(f.last_checked_ts).toLocaleString()}</td>
+                        <td>${f.attack_count}</td>
+                    </tr>
+                `).join('')}
+            </tbody>
+        </table>
+    `;
+
+    // Load recent processes
+    const processes = await fetch('/api/processes/recent').then(r => r.json());
+    document.getElementById('processes').innerHTML = `
+        <table>
+            <thead>
+                <tr>
+                    <th>Timestamp</th>
+                    <th>Process Name</th>
+                    <th>PID</th>
+                    <th>Threat Score</th>
+                    <th>Suspicious</th>
+                </tr>
+            </thead>
+            <tbody>
+                ${processes.map(p => `
+                    <tr>
+                        <td>${new Date(p.ts).toLocaleString()}</td>
+                        <td>${p.process_name}</td>
+                        <td>${p.process_id}</td>
+                        <td>${p.threat_score.toFixed(2)}</td>
+                        <td class="${p.is_suspicious ? 'status-inactive' : 'status-active'}">
+                            ${p.is_suspicious ? 'Yes' : 'No'}
+                        </td>
+                    </tr>
+                `).join('')}
+            </tbody>
+        </table>
+    `;
+}
+
+function showResult(message, isError = false) {
+    const resultDiv = document.getElementById('actionResult');
+    resultDiv.innerHTML = `<div class="alert ${isError ? 'alert-danger' : ''}">${message}</div>`;
+    setTimeout(() => { resultDiv.innerHTML = ''; }, 5000);
+}
+
+async function addFile() {
+    const filePath = document.getElementById('filePath').value;
+    if (!filePath) {
+        showResult('❌ Please enter a file path', true);
+        return;
+    }
+
+    try {
+        const response = await fetch('/api/files/add', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ file_path: filePath })
+        });
+        const data = await response.json();
+
+        if (response.ok) {
+            showResult(`✅ File added to monitoring: ${data.file_path}`);
+            document.getElementById('filePath').value = '';
+            loadDashboard();
+        } else {
+            showResult(`❌ Error: ${data.error}`, true);
+        }
+    } catch (error) {
+        showResult(`❌ Failed to add file: ${error.message}`, true);
+    }
+}
+
+async function scanFiles() {
+    showResult('🔍 Scanning all monitored files...');
+    try {
+        const response = await fetch('/api/files/scan', { method: 'POST' });
+        const data = await response.json();
+
+        if (data.compromised_count > 0) {
+            showResult(`⚠️ Scan complete: ${data.compromised_count} compromised files found!`, true);
+        } else {
+            showResult(`✅ Scan complete: All ${data.total_scanned} files are secure`);
+        }
+        loadDashboard();
+    } catch (error) {
+        showResult(`❌ Scan failed: ${error.message}`, true);
+    }
+}
+
+async function scanProcesses() {
+    showResult('🖥️ Scanning running processes...');
+    try {
+        const response = await fetch('/api/processes/scan', { method: 'POST' });
+        const data = await response.json();
+
+        if (data.suspicious_count > 0) {
+            showResult(`⚠️ Found ${data.suspicious_count} suspicious processes!`, true);
+        } else {
+            showResult(`✅ Process scan complete: No threats detected`);
+        }
+        loadDashboard();
+    } catch (error) {
+        showResult(`❌ Scan failed: ${error.message}`, true);
+    }
+}
+
+async function simulateAttack(attackType) {
+    showResult(`⚠️ Simulating ${attackType} attack...`);
+    try {
+        const response = await fetch('/api/test/attack', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ attack_type: attackType })
+        });
+        const data = await response.json();
+
+        showResult(`✅ ${data.message} - Check events below!`);
+        loadDashboard();
+    } catch (error) {
+        showResult(`❌ Simulation failed: ${error.message}`, true);
+    }
+}
+
+async function testEncryption() {
+    const text = document.getElementById('encryptInput').value;
+    if (!text) {
+        document.getElementById('encryptResult').innerHTML = 
+            '<div class="alert alert-danger">⚠️ Please enter text to encrypt</div>';
+        return;
+    }
+
+    try {
+        const response = await fetch('/api/security/encrypt', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ data: text })
+        });
+        const data = await response.json();
+
+        if (response.ok) {
+            document.getElementById('encryptResult').innerHTML = `
+                <div class="alert">
+                    <strong>✅ Encrypted with ${data.algorithm}</strong><br>
+                    <small style="word-break: break-all;">
+                        ${data.encrypted.substring(0, 80)}...
+                    </small>
+                </div>
+            `;
+        } else {
+            document.getElementById('encryptResult').innerHTML = 
+                `<div class="alert alert-danger">❌ ${data.error}</div>`;
+        }
+    } catch (error) {
+        document.getElementById('encryptResult').innerHTML = 
+            `<div class="alert alert-danger">❌ Encryption failed: ${error.message}</div>`;
+    }
+}
+
+async function loadTraining() {
+    const container = document.getElementById('trainingContent');
+    container.innerHTML = '<p>Loading training scenarios...</p>';
+
+    try {
+        const response = await fetch('/api/training/scenarios');
+        const data = await response.json();
+
+        if (data.status === 'success') {
+            let html = '<div style="margin-top: 15px;">';
+            html += `<p><strong>Total Scenarios:</strong> ${data.total_scenarios}</p>`;
+
+            data.scenarios.forEach(scenario => {
+                html += `
+                    <div style="background: rgba(255,255,255,0.05); padding: 15px; margin: 10px 0; border-radius: 8px;">
+                        <h3>${scenario.title}</h3>
+                        <p><strong>Difficulty:</strong> <span style="color: ${
+                            scenario.difficulty === 'Easy' ? '#10b981' : 
+                            scenario.difficulty === 'Medium' ? '#f59e0b' : '#ef4444'
+                        }">${scenario.difficulty}</span> | <strong>Points:</strong> ${scenario.points}</p>
+                        <p>${scenario.description}</p>
+                        <div style="background: rgba(0,0,0,0.3); padding: 10px; margin: 10px 0; border-radius: 5px; white-space: pre-wrap; font-family: monospace; font-size: 0.9em;">${scenario.scenario}</div>
+                        <div style="margin: 10px 0;">
+                            ${Object.entries(scenario.options).map(([key, value]) => 
+                                `<button class="btn-primary" style="margin: 5px; display: block;" onclick="checkAnswer(${scenario.id}, '${key}')">${key}. ${value}</button>`
+                            ).join('')}
+                        </div>
+                        <div id="result-${scenario.id}" style="margin-top: 10px;"></div>
+                    </div>
+                `;
+            });
+
+            html += '</div>';
+            container.innerHTML = html;
+        }
+    } catch (error) {
+        container.innerHTML = '<p style="color: #ef4444;">Error loading training: ' + error.message + '</p>';
+    }
+}
+
+async function checkAnswer(scenarioId, answer) {
+    const resultDiv = document.getElementById(`result-${scenarioId}`);
+    resultDiv.innerHTML = '<p>Checking answer...</p>';
+
+    try {
+        const response = await fetch('/api/training/check-answer', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ scenario_id: scenarioId, answer: answer })
+        });
+
+        const data = await response.json();
+
+        if (data.status === 'success') {
+            const color = data.correct ? '#10b981' : '#ef4444';
+            const icon = data.correct ? '✅' : '❌';
+            resultDiv.innerHTML = `
+                <div style="background: rgba(${data.correct ? '16, 185, 129' : '239, 68, 68'}, 0.1); padding: 15px; border-radius: 5px; border-left: 4px solid ${color};">
+                    <p><strong>${icon} ${data.correct ? 'CORRECT!' : 'INCORRECT'}</strong></p>
+                    <p><strong>Correct Answer:</strong> ${data.correct_answer}</p>
+                    <p><strong>Points Earned:</strong> ${data.points_earned}/${data.max_points}</p>
+                    <div style="margin-top: 10px; white-space: pre-wrap; font-size: 0.9em;">${data.explanation}</div>
+                </div>
+            `;
+        }
+    } catch (error) {
+        resultDiv.innerHTML = '<p style="color: #ef4444;">Error: ' + error.message + '</p>';
+    }
+}
+
+async function loadQuantumStats() {
+    const container = document.getElementById('quantumStats');
+    container.innerHTML = '<p>Loading quantum data...</p>';
+
+    try {
+        const response = await fetch('/api/quantum/stats');
+        const data = await response.json();
+
+        if (data.status === 'success') {
+            const state = data.system_state;
+            const physics = data.physics;
+            const trends = data.trends;
+            const summary = data.summary;
+
+            let html = '<div style="margin-top: 15px;">';
+
+            // System State
+            html += `
+                <div style="background: rgba(${state.quantum_intact ? '16, 185, 129' : '239, 68, 68'}, 0.1); padding: 15px; margin: 10px 0; border-radius: 8px;">
+                    <h3>🔐 Quantum System State</h3>
+                    <p><strong>Status:</strong> <span style="color: ${state.quantum_intact ? '#10b981' : '#ef4444'}">${state.quantum_intact ? '✅ INTACT' : '⚠️ COMPROMISED'}</span></p>
+                    <p><strong>System Version:</strong> ${state.system_version}</p>
+                    <p><strong>Last Reset:</strong> ${state.last_reset || 'Never'}</p>
+                </div>
+            `;
+
+            // Physics Explanation
+            html += `
+                <div style="background: rgba(139, 92, 246, 0.1); padding: 15px; margin: 10px 0; border-radius: 8px;">
+                    <h3>⚛️ Quantum Physics Protection</h3>
+                    <p><strong>Bell State:</strong> <code>${physics.bell_state}</code></p>
+                    <p><strong>Principle:</strong> ${physics.entanglement}</p>
+                    <p><strong>Detection Method:</strong> ${physics.detection_method}</p>
+                    <p><strong>Algorithm:</strong> ${physics.algorithm}</p>
+                    <p style="margin-top: 10px; font-size: 0.9em; color: #a78bfa;">
+                        <em>When qubits are entangled in a Bell state, any eavesdropping attempt causes 
+                        quantum decoherence, breaking the correlation and triggering an alert.</em>
+                    </p>
+                </div>
+            `;
+
+            // Trends
+            if (summary.count > 0) {
+                // Averages are null when every measurement in the window lacks the value
+                const avgEntropy = summary.avg_entropy != null ? summary.avg_entropy.toFixed(4) : 'N/A';
+                const avgCorr = summary.avg_correlation != null ? summary.avg_correlation.toFixed(2) + '%' : 'N/A';
+                const totalAttacks = summary.total_attacks;
+
+                html += `
+                    <div style="background: rgba(59, 130, 246, 0.1); padding: 15px; margin: 10px 0; border-radius: 8px;">
+                        <h3>📊 Recent Measurements (Last 50)</h3>
+                        <div style="display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 10px;">
+                            <div>
+                                <p><strong>Avg Entropy:</strong></p>
+                                <p style="font-size: 1.5em; color: #60a5fa;">${avgEntropy}</p>
+                            </div>
+                            <div>
+                                <p><strong>Avg Correlation:</strong></p>
+                                <p style="font-size: 1.5em; color: #34d399;">${avgCorr}</p>
+                            </div>
+                            <div>
+                                <p><strong>Attack Detections:</strong></p>
+                                <p style="font-size: 1.5em; color: #f87171;">${totalAttacks}</p>
+                            </div>
+                        </div>
+                        <p style="margin-top: 15px;"><strong>Entropy Trend:</strong> ${trends.entropy.slice(-10).map(e => e != null ? e.toFixed(2) : 'N/A').join(', ')}</p>
+                        <p><strong>Correlation Trend:</strong> ${trends.correlation.slice(-10).map(c => c != null ? c.toFixed(1) + '%' : 'N/A').join(', ')}</p>
+                    </div>
+                `;
+            }
+
+            html += '</div>';
+            container.innerHTML = html;
+        }
+    } catch (error) {
+        container.innerHTML = '<p style="color: #ef4444;">Error loading quantum data: ' + error.message + '</p>';
+    }
+}
+
+let pollTimer = null;
+
+function startPolling(interval) {
+    clearInterval(pollTimer);
+    pollTimer = setInterval(loadDashboard, interval);
+}
+
+loadDashboard();
+if (window.EventSource) {
+    // The server pushes a message whenever dashboard data changes, from any process
+    const stream = new EventSource('/api/stream');
+    stream.onmessage = () => loadDashboard();
+    stream.onerror = () => {
+        // EventSource reconnects on its own; poll only once it has given up
+        if (stream.readyState === EventSource.CLOSED) startPolling(5000);
+    };
+} else {
+    startPolling(5000); // Refresh every 5 seconds
+}
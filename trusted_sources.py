@@ -3,29 +3,69 @@ QuantumShield - Trusted Security Sources Verification Module
 Validates files, processes, and network connections against trusted security sources
 """
 
+import atexit
+import copy
 import hashlib
 import json
+import logging
 import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional, Set
 import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Adds are written out at most this often; bulk imports become one write
+SAVE_DELAY_SECONDS = 5.0
+
+# Concurrent VirusTotal lookups; also the size of the kept-alive connection pool
+VIRUSTOTAL_WORKERS = 16
+
+DANGEROUS_EXTENSIONS = frozenset({'.exe', '.dll', '.bat', '.cmd', '.ps1', '.vbs', '.js'})
+
+def _stat_signature(st):
+    # ctime cannot be set from user space, so swapping a file's contents and
+    # restoring its mtime still changes the signature
+    return (st.st_size, st.st_mtime_ns, st.st_ctime_ns, st.st_ino)
 
 class TrustedSourcesManager:
     """Manages verification against trusted security sources"""
     
+    # Parsed stores shared by every instance: abspath -> ((st_mtime_ns, st_size), data)
+    _json_cache = {}
+    
     def __init__(self):
         self.trusted_hashes_file = "trusted_hashes.json"
         self.trusted_domains_file = "trusted_domains.json"
         self.trusted_certificates_file = "trusted_certificates.json"
+        # path -> (stat signature, sha256 hex) for hash_files()
+        self._hash_cache = {}
+        # Trust scores keyed by path and stat signature, so a re-polled file
+        # that hasn't changed is not hashed again
+        self._scored = lru_cache(maxsize=4096)(self._score_file)
+        # Stores changed since the last write, and the pending write timer.
+        # The lock also covers every change to the stores, so a flush never
+        # serializes a dict another thread is adding to; it is re-entrant
+        # because the add methods mark their store dirty while holding it.
+        self._dirty = set()
+        self._save_timer = None
+        self._save_lock = threading.RLock()
+        # Reuses the TCP/TLS connection across VirusTotal lookups
+        self._vt_session = requests.Session()
+        self._vt_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=VIRUSTOTAL_WORKERS))
         self.load_trusted_sources()
+        atexit.register(self.flush)
         
     def load_trusted_sources(self):
         """Load all trusted sources from storage"""
         # Trusted file hashes
-        if os.path.exists(self.trusted_hashes_file):
-            with open(self.trusted_hashes_file, 'r') as f:
-                self.trusted_hashes = json.load(f)
-        else:
+        self.trusted_hashes = self._load_json(self.trusted_hashes_file)
+        if self.trusted_hashes is None:
             self.trusted_hashes = {
                 "system_files": [],
                 "applications": [],
@@ -33,10 +73,8 @@ class TrustedSourcesManager:
             }
             
         # Trusted domains
-        if os.path.exists(self.trusted_domains_file):
-            with open(self.trusted_domains_file, 'r') as f:
-                self.trusted_domains = json.load(f)
-        else:
+        self.trusted_domains = self._load_json(self.trusted_domains_file)
+        if self.trusted_domains is None:
             self.trusted_domains = {
                 "verified_sources": [
                     "github.com",
@@ -54,35 +92,134 @@ class TrustedSourcesManager:
             }
             
         # Trusted certificates
-        if os.path.exists(self.trusted_certificates_file):
-            with open(self.trusted_certificates_file, 'r') as f:
-                self.trusted_certificates = json.load(f)
-        else:
+        self.trusted_certificates = self._load_json(self.trusted_certificates_file)
+        if self.trusted_certificates is None:
             self.trusted_certificates = {
                 "ca_fingerprints": [],
                 "verified_signatures": []
             }
+        
+        self._index_hashes()
+        self._index_domains()
+        # Scores depend on the trusted hashes just (re)loaded
+        self._scored.cache_clear()
+    
+    def _load_json(self, path: str) -> Optional[Dict]:
+        """Read one trusted sources file, parsing it only when it has changed"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        key = os.path.abspath(path)
+        signature = (st.st_mtime_ns, st.st_size)
+        cached = self._json_cache.get(key)
+        if cached is None or cached[0] != signature:
+            with open(path, 'r') as f:
+                cached = (signature, json.load(f))
+            self._json_cache[key] = cached
+        # Each instance appends to its own lists, never the shared parse
+        return {category: list(entries) for category, entries in cached[1].items()}
+    
+    def _index_hashes(self):
+        """Map each trusted hash to the first category that lists it"""
+        self._hash_index = {}
+        for category, hashes in self.trusted_hashes.items():
+            for file_hash in hashes:
+                self._hash_index.setdefault(file_hash, category)
+    
+    def _index_domains(self):
+        """Suffix tuples per category, for one C-level endswith() call each"""
+        self._domain_suffixes = [
+            (category, tuple(domains))
+            for category, domains in self.trusted_domains.items()
+        ]
+    
+    def _save_json(self, path: str, data: Dict):
+        """Write one trusted sources file"""
+        # Write a temporary file and swap it in, so a crash mid-write never
+        # leaves a truncated store behind
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile('w', dir=directory, delete=False) as f:
+            # Compact separators: these stores are only read back by load_trusted_sources()
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(f.name, path)
+    
+    def _mark_dirty(self, path: str):
+        """Schedule a store to be written on the next flush"""
+        with self._save_lock:
+            self._dirty.add(path)
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(SAVE_DELAY_SECONDS, self._flush_from_timer)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+    
+    def flush(self):
+        """Write every store changed since the last flush"""
+        stores = {
+            self.trusted_hashes_file: self.trusted_hashes,
+            self.trusted_domains_file: self.trusted_domains,
+            self.trusted_certificates_file: self.trusted_certificates
+        }
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            # A store leaves the dirty set only once it is on disk, so a
+            # failed write is retried by the next flush
+            for path in list(self._dirty):
+                self._save_json(path, stores[path])
+                self._dirty.discard(path)
+    
+    def _flush_from_timer(self):
+        # Nobody waits on the timer thread, so report failures here
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Failed to save trusted sources")
     
     def save_trusted_sources(self):
         """Save all trusted sources to storage"""
-        with open(self.trusted_hashes_file, 'w') as f:
-            json.dump(self.trusted_hashes, f, indent=2)
-        with open(self.trusted_domains_file, 'w') as f:
-            json.dump(self.trusted_domains, f, indent=2)
-        with open(self.trusted_certificates_file, 'w') as f:
-            json.dump(self.trusted_certificates, f, indent=2)
+        with self._save_lock:
+            self._dirty.clear()
+            self._save_json(self.trusted_hashes_file, self.trusted_hashes)
+            self._save_json(self.trusted_domains_file, self.trusted_domains)
+            self._save_json(self.trusted_certificates_file, self.trusted_certificates)
     
     def calculate_file_hash(self, filepath: str) -> Optional[str]:
         """Calculate SHA-256 hash of a file"""
         try:
-            sha256_hash = hashlib.sha256()
+            # file_digest reads into one reusable buffer instead of
+            # allocating a new 4 KB bytes object per block
             with open(filepath, "rb") as f:
-                for byte_block in iter(lambda: f.read(4096), b""):
-                    sha256_hash.update(byte_block)
-            return sha256_hash.hexdigest()
+                return hashlib.file_digest(f, "sha256").hexdigest()
         except Exception as e:
             return None
     
+    def _cached_file_hash(self, filepath: str) -> Optional[str]:
+        """SHA-256 of a file, reused while its mtime and size are unchanged"""
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return None
+        signature = _stat_signature(st)
+        cached = self._hash_cache.get(filepath)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        file_hash = self.calculate_file_hash(filepath)
+        if file_hash is not None:
+            self._hash_cache[filepath] = (signature, file_hash)
+        return file_hash
+    
+    def hash_files(self, filepaths: List[str]) -> Dict[str, Optional[str]]:
+        """Calculate SHA-256 hashes of many files in parallel"""
+        filepaths = list(filepaths)
+        if not filepaths:
+            return {}
+        # hashlib releases the GIL while hashing, so threads scale with cores
+        workers = min(len(filepaths), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return dict(zip(filepaths, pool.map(self._cached_file_hash, filepaths)))
+    
     def verify_file_hash(self, filepath: str) -> Dict:
         """Verify if a file's hash is in trusted sources"""
         file_hash = self.calculate_file_hash(filepath)
@@ -93,15 +230,15 @@ class TrustedSourcesManager:
                 "hash": None
             }
         
-        # Check all trusted hash categories
-        for category, hashes in self.trusted_hashes.items():
-            if file_hash in hashes:
-                return {
-                    "trusted": True,
-                    "reason": f"Found in {category}",
-                    "hash": file_hash,
-                    "category": category
-                }
+        # One lookup across all trusted hash categories
+        category = self._hash_index.get(file_hash)
+        if category is not None:
+            return {
+                "trusted": True,
+                "reason": f"Found in {category}",
+                "hash": file_hash,
+                "category": category
+            }
         
         return {
             "trusted": False,
@@ -115,22 +252,27 @@ class TrustedSourcesManager:
         if not file_hash:
             return False
         
-        if category not in self.trusted_hashes:
-            self.trusted_hashes[category] = []
-        
-        if file_hash not in self.trusted_hashes[category]:
-            self.trusted_hashes[category].append(file_hash)
-            self.save_trusted_sources()
-            return True
-        return False
+        with self._save_lock:
+            if category not in self.trusted_hashes:
+                self.trusted_hashes[category] = []
+            
+            if file_hash not in self.trusted_hashes[category]:
+                self.trusted_hashes[category].append(file_hash)
+                # Same first-category-wins rule as _index_hashes, without a rebuild
+                self._hash_index.setdefault(file_hash, category)
+                self._scored.cache_clear()
+                # Only the hashes changed; leave the other stores untouched
+                self._mark_dirty(self.trusted_hashes_file)
+                return True
+            return False
     
     def verify_domain(self, domain: str) -> Dict:
         """Verify if a domain is trusted"""
         domain = domain.lower().strip()
         
-        # Check all trusted domain categories
-        for category, domains in self.trusted_domains.items():
-            if domain in domains or any(domain.endswith(d) for d in domains):
+        # Check all trusted domain categories; an exact match is also a suffix match
+        for category, suffixes in self._domain_suffixes:
+            if domain.endswith(suffixes):
                 return {
                     "trusted": True,
                     "reason": f"Found in {category}",
@@ -148,14 +290,16 @@ class TrustedSourcesManager:
         """Add a domain to trusted sources"""
         domain = domain.lower().strip()
         
-        if category not in self.trusted_domains:
-            self.trusted_domains[category] = []
-        
-        if domain not in self.trusted_domains[category]:
-            self.trusted_domains[category].append(domain)
-            self.save_trusted_sources()
-            return True
-        return False
+        with self._save_lock:
+            if category not in self.trusted_domains:
+                self.trusted_domains[category] = []
+            
+            if domain not in self.trusted_domains[category]:
+                self.trusted_domains[category].append(domain)
+                self._index_domains()
+                self._mark_dirty(self.trusted_domains_file)
+                return True
+            return False
     
     def check_virustotal(self, file_hash: str, api_key: Optional[str] = None) -> Dict:
         """Check file hash against VirusTotal (requires API key)"""
@@ -171,7 +315,7 @@ class TrustedSourcesManager:
         try:
             url = f"https://www.virustotal.com/api/v3/files/{file_hash}"
             headers = {"x-apikey": api_key}
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self._vt_session.get(url, headers=headers, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -197,8 +341,29 @@ class TrustedSourcesManager:
                 "reason": f"Error checking VirusTotal: {str(e)}"
             }
     
+    def check_virustotal_many(self, file_hashes: List[str], api_key: Optional[str] = None) -> Dict[str, Dict]:
+        """Check several file hashes against VirusTotal concurrently"""
+        file_hashes = list(dict.fromkeys(file_hashes))
+        if not file_hashes:
+            return {}
+        workers = min(len(file_hashes), VIRUSTOTAL_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(lambda file_hash: self.check_virustotal(file_hash, api_key), file_hashes)
+            return dict(zip(file_hashes, results))
+    
     def get_trust_score(self, filepath: str) -> Dict:
         """Calculate overall trust score for a file"""
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return self._score_file(filepath)
+        # Deep copy: callers must not be able to edit the cached checks
+        results = copy.deepcopy(self._scored(filepath, *_stat_signature(st)))
+        results["timestamp"] = datetime.now().isoformat()
+        return results
+    
+    def _score_file(self, filepath: str, *signature) -> Dict:
+        # signature only distinguishes cache entries; see get_trust_score()
         results = {
             "filepath": filepath,
             "timestamp": datetime.now().isoformat(),
@@ -227,12 +392,12 @@ class TrustedSourcesManager:
         
         # Check file extension
         ext = os.path.splitext(filepath)[1].lower()
-        dangerous_extensions = ['.exe', '.dll', '.bat', '.cmd', '.ps1', '.vbs', '.js']
+        dangerous = ext in DANGEROUS_EXTENSIONS
         results["checks"]["file_extension"] = {
             "extension": ext,
-            "potentially_dangerous": ext in dangerous_extensions
+            "potentially_dangerous": dangerous
         }
-        if ext not in dangerous_extensions:
+        if not dangerous:
             results["trust_score"] += 30
         
         # Determine recommendation